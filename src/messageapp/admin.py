@@ -3,9 +3,18 @@ Admin configuration for the messages app.
 """
 
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.db.models.functions import Substr
 from .models import Message, TaskLog
 
 
+class MessageChangeList(ChangeList):
+    """Changelist that fetches only the first 101 characters of content for the preview column."""
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(preview=Substr("content", 1, 101)).defer("content")
+
+
 @admin.register(Message)
 class MessageAdmin(admin.ModelAdmin):
     """Admin interface for Message model."""
@@ -15,9 +24,13 @@ class MessageAdmin(admin.ModelAdmin):
     search_fields = ("content",)
     readonly_fields = ("created_at", "processed_at", "task_id")
 
+    def get_changelist(self, request, **kwargs):
+        """Use the preview-only queryset on the changelist; change and delete views still load content."""
+        return MessageChangeList
+
     def content_preview(self, obj):
         """Show a preview of the message content."""
-        return obj.content[:100] + "..." if len(obj.content) > 100 else obj.content
+        return obj.preview[:100] + "..." if len(obj.preview) > 100 else obj.preview
 
     content_preview.short_description = "Message Content"
 
@@ -2,16 +2,42 @@
 API views for the messageapp.
 """
 
+import hashlib
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from django.db.models import Count, Max, Q
+from django.db.models.functions import Substr
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import etag
+
+from ..models import Message, TaskLog, TaskLogStatusCount
+from ..serializers import (
+    MessageSerializer,
+    MessageListSerializer,
+    MessageCreateSerializer,
+    MessageBulkProcessSerializer,
+    TaskLogSerializer,
+    TaskLogListSerializer,
+)
+from ..tasks import process_message_task, process_messages
+
+# Maximum number of messages returned by the search action
+SEARCH_RESULT_LIMIT = 500
+
+# Number of content characters returned by MessageListSerializer
+CONTENT_PREVIEW_LENGTH = 100
+
 
-from ..models import Message, TaskLog
-from ..serializers import MessageSerializer, MessageCreateSerializer, TaskLogSerializer
-from ..tasks import process_message_task
+def message_list_etag(request, *args, **kwargs):
+    """ETag for message listings, derived from the row count and the latest modification time."""
+    state = Message.objects.aggregate(count=Count("id"), last_modified=Max("updated_at"))
+    last_modified = state["last_modified"].timestamp() if state["last_modified"] else 0
+    return hashlib.md5(f"{state['count']}:{last_modified}".encode(), usedforsecurity=False).hexdigest()
 
 
 class MessageViewSet(viewsets.ModelViewSet):
@@ -26,26 +52,44 @@ class MessageViewSet(viewsets.ModelViewSet):
     search_fields = ["content"]
     ordering_fields = ["created_at", "processed_at"]
     ordering = ["-created_at"]
+    pagination_class = PageNumberPagination
 
     def get_serializer_class(self):
         """Return appropriate serializer based on action."""
         if self.action == "create":
             return MessageCreateSerializer
+        if self.action in ("processed", "unprocessed"):
+            return MessageListSerializer
         return MessageSerializer
 
+    def get_preview_queryset(self):
+        """Messages with a server-side content preview, leaving the full content column unloaded."""
+        return self.queryset.annotate(content_preview=Substr("content", 1, CONTENT_PREVIEW_LENGTH)).defer("content")
+
+    def get_paginated_data(self, queryset):
+        """Serialize one page of the queryset and wrap it in the paginated response."""
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+
+    @method_decorator(etag(message_list_etag))
+    def list(self, request, *args, **kwargs):
+        """List messages, answering 304 Not Modified when nothing has changed."""
+        return super().list(request, *args, **kwargs)
+
     @action(detail=False, methods=["get"])
+    @method_decorator(etag(message_list_etag))
     def processed(self, request):
         """Get only processed messages."""
-        processed_messages = self.queryset.filter(processed_at__isnull=False)
-        serializer = self.get_serializer(processed_messages, many=True)
-        return Response(serializer.data)
+        processed_messages = self.get_preview_queryset().filter(processed_at__isnull=False)
+        return self.get_paginated_data(processed_messages)
 
     @action(detail=False, methods=["get"])
+    @method_decorator(etag(message_list_etag))
     def unprocessed(self, request):
         """Get unprocessed messages."""
-        unprocessed_messages = self.queryset.filter(processed_at__isnull=True)
-        serializer = self.get_serializer(unprocessed_messages, many=True)
-        return Response(serializer.data)
+        unprocessed_messages = self.get_preview_queryset().filter(processed_at__isnull=True)
+        return self.get_paginated_data(unprocessed_messages)
 
     @action(detail=True, methods=["post"])
     def process_async(self, request, pk=None):
@@ -57,6 +101,21 @@ class MessageViewSet(viewsets.ModelViewSet):
 
         return Response({"message": "Processing message asynchronously", "task_id": task.id, "message_id": message.id})
 
+    @action(detail=False, methods=["post"])
+    def process_bulk(self, request):
+        """Process several messages asynchronously, submitting one Celery task per message."""
+        serializer = MessageBulkProcessSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        # Only dispatch messages that exist
+        message_ids = list(
+            Message.objects.filter(id__in=serializer.validated_data["message_ids"]).values_list("id", flat=True)
+        )
+        if message_ids:
+            process_messages(message_ids)
+
+        return Response({"message": "Processing messages asynchronously", "message_ids": message_ids})
+
     @action(detail=False, methods=["get"])
     def search(self, request):
         """Advanced search across content."""
@@ -64,9 +123,12 @@ class MessageViewSet(viewsets.ModelViewSet):
         if not query:
             return Response({"message": "Message processing started"}, status=status.HTTP_202_ACCEPTED)
 
-        messages = self.queryset.filter(Q(content__icontains=query))
-        serializer = self.get_serializer(messages, many=True)
-        return Response({"query": query, "count": messages.count(), "results": serializer.data})
+        # icontains compiles to UPPER(content) LIKE, which the msg_content_trgm GIN index serves.
+        # Evaluate once and cap the result size to bound serialization cost
+        messages = list(self.queryset.filter(Q(content__icontains=query))[:SEARCH_RESULT_LIMIT])
+        response = self.get_paginated_data(messages)
+        response.data["query"] = query
+        return response
 
 
 class TaskLogViewSet(viewsets.ReadOnlyModelViewSet):
@@ -81,20 +143,37 @@ class TaskLogViewSet(viewsets.ReadOnlyModelViewSet):
     ordering_fields = ["started_at", "completed_at"]
     ordering = ["-started_at"]
 
+    def get_serializer_class(self):
+        """Return appropriate serializer based on action."""
+        if self.action in ("list", "recent"):
+            return TaskLogListSerializer
+        return TaskLogSerializer
+
+    def get_queryset(self):
+        """Leave the result column unloaded on list views, which don't serialize it."""
+        queryset = super().get_queryset()
+        if self.action in ("list", "recent"):
+            queryset = queryset.defer("result")
+        return queryset
+
     @action(detail=False, methods=["get"])
     def recent(self, request):
         """Get recent task logs (last 50)."""
-        recent_logs = self.queryset[:50]
+        recent_logs = self.get_queryset()[:50]
         serializer = self.get_serializer(recent_logs, many=True)
         return Response(serializer.data)
 
     @action(detail=False, methods=["get"])
     def stats(self, request):
-        """Get task execution statistics."""
-        total_tasks = self.queryset.count()
-        completed_tasks = self.queryset.filter(status="SUCCESS").count()
-        failed_tasks = self.queryset.filter(status="FAILURE").count()
-        pending_tasks = self.queryset.filter(status="STARTED").count()
+        """
+        Get task execution statistics.
+        Counts come from a materialized view refreshed by Celery Beat, so they may lag by up to 30 seconds.
+        """
+        counts = dict(TaskLogStatusCount.objects.values_list("status", "n"))
+        total_tasks = sum(counts.values())
+        completed_tasks = counts.get("SUCCESS", 0)
+        failed_tasks = counts.get("FAILURE", 0)
+        pending_tasks = counts.get("STARTED", 0)
 
         return Response(
             {
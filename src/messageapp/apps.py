@@ -8,3 +8,7 @@ from django.apps import AppConfig
 class MessageappConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "messageapp"
+
+    def ready(self):
+        # Register the Celery heartbeat receiver used by the worker health check
+        from .health import heartbeats  # noqa: F401
@@ -0,0 +1,50 @@
+"""
+Passive Celery worker liveness tracking through Redis heartbeat keys.
+
+Workers record a last-seen timestamp each time they send their regular event
+heartbeat, so health checks can read those keys instead of broadcasting an
+inspect request to every worker.
+"""
+
+import time
+from celery.signals import heartbeat_sent
+import logging
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_KEY_PREFIX = "celery:worker:"
+HEARTBEAT_KEY_SUFFIX = ":last_seen"
+
+# Workers without a heartbeat in this many seconds are considered down
+HEARTBEAT_MAX_AGE = 30
+
+
+def heartbeat_key(hostname):
+    """Redis key holding the last heartbeat timestamp for a worker."""
+    return f"{HEARTBEAT_KEY_PREFIX}{hostname}{HEARTBEAT_KEY_SUFFIX}"
+
+
+@heartbeat_sent.connect
+def record_worker_heartbeat(sender, **kwargs):
+    """Store the worker's last-seen timestamp whenever it sends a heartbeat."""
+    from .views import _get_redis
+
+    try:
+        _get_redis().set(heartbeat_key(sender.eventer.hostname), time.time(), ex=HEARTBEAT_MAX_AGE * 2)
+    except Exception as e:
+        logger.warning(f"Failed to record worker heartbeat: {e}")
+
+
+def get_live_workers(client, max_age=HEARTBEAT_MAX_AGE):
+    """Return the hostnames of workers that sent a heartbeat within the last max_age seconds."""
+    keys = list(client.scan_iter(match=heartbeat_key("*")))
+    if not keys:
+        return []
+
+    now = time.time()
+    worker_names = []
+    for key, last_seen in zip(keys, client.mget(keys)):
+        if last_seen is not None and now - float(last_seen) < max_age:
+            key = key.decode() if isinstance(key, bytes) else key
+            worker_names.append(key.removeprefix(HEARTBEAT_KEY_PREFIX).removesuffix(HEARTBEAT_KEY_SUFFIX))
+    return worker_names
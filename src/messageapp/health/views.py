@@ -3,17 +3,71 @@ Health check views for system monitoring and deployment verification.
 """
 
 import time
-from django.http import JsonResponse
+from concurrent import futures
+from django.http import HttpResponse, JsonResponse
 from django.db import connection
+from django.db.models import Count, Q
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.cache import never_cache
 from django.conf import settings
 from celery import current_app
+import orjson
 import redis
 import logging
 
+from .heartbeats import HEARTBEAT_MAX_AGE, get_live_workers
+
 logger = logging.getLogger(__name__)
 
+# Shared Redis client, created lazily and reused across probes
+_REDIS_CLIENT = None
+
+
+def _get_redis():
+    """Return the shared Redis client, connecting on first use."""
+    global _REDIS_CLIENT
+    if _REDIS_CLIENT is None:
+        redis_url = getattr(settings, "CELERY_BROKER_URL", "redis://localhost:6379/0")
+        _REDIS_CLIENT = redis.from_url(redis_url, socket_connect_timeout=1, socket_timeout=1, health_check_interval=30)
+    return _REDIS_CLIENT
+
+
+def _reset_redis():
+    """Drop the shared Redis client so the next probe reconnects."""
+    global _REDIS_CLIENT
+    _REDIS_CLIENT = None
+
+
+def _orjson_response(data, status=200):
+    """Serialize a small probe payload with orjson, skipping JsonResponse's stdlib encoder."""
+    return HttpResponse(orjson.dumps(data), content_type="application/json", status=status)
+
+
+# Pre-serialized liveness body; only the timestamp varies per request
+_LIVE_PREFIX = b'{"status":"alive","message":"Application is alive and responding","timestamp":'
+_LIVE_SUFFIX = b"}"
+
+
+# Pool for the network-bound Redis and Celery probes. Database checks stay on
+# the request thread, which owns the request's database connection.
+_CHECK_EXECUTOR = futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="health-check")
+
+# Seconds to wait for pooled sub-checks before reporting them as unhealthy
+CHECK_TIMEOUT = 2
+
+
+def _collect_check(future, name, deadline):
+    """Return a pooled sub-check's result, or an unhealthy result if it misses the deadline."""
+    try:
+        return future.result(timeout=max(deadline - time.monotonic(), 0))
+    except futures.TimeoutError:
+        logger.error(f"{name} health check timed out after {CHECK_TIMEOUT} seconds")
+        return {
+            "status": "unhealthy",
+            "message": f"{name} check timed out",
+            "details": {"error": "timeout", "timeout_seconds": CHECK_TIMEOUT},
+        }
+
 
 @require_http_methods(["GET"])
 @never_cache
@@ -30,20 +84,20 @@ def health_check(request):
         "summary": {"total_checks": 0, "passed": 0, "failed": 0},
     }
 
-    # Database connectivity check
+    # Start the Redis and Celery checks in the background
+    deadline = time.monotonic() + CHECK_TIMEOUT
+    redis_future = _CHECK_EXECUTOR.submit(check_redis)
+    celery_future = _CHECK_EXECUTOR.submit(check_celery)
+
+    # Database and application checks run meanwhile on this thread
     db_check = check_database()
-    health_status["checks"]["database"] = db_check
+    app_check = check_application()
+    redis_check = _collect_check(redis_future, "Redis", deadline)
+    celery_check = _collect_check(celery_future, "Celery", deadline)
 
-    # Redis connectivity check
-    redis_check = check_redis()
+    health_status["checks"]["database"] = db_check
     health_status["checks"]["redis"] = redis_check
-
-    # Celery worker check
-    celery_check = check_celery()
     health_status["checks"]["celery"] = celery_check
-
-    # Application-specific checks
-    app_check = check_application()
     health_status["checks"]["application"] = app_check
 
     # Calculate summary
@@ -73,10 +127,10 @@ def check_database():
             cursor.execute("SELECT 1")
             cursor.fetchone()
 
-        # Test table access
+        # Test table access with a LIMIT 1 probe rather than a full count
         from ..models import Message
 
-        message_count = Message.objects.count()
+        Message.objects.only("id").exists()
 
         return {
             "status": "healthy",
@@ -84,7 +138,6 @@ def check_database():
             "details": {
                 "connection_test": "passed",
                 "table_access": "passed",
-                "message_count": message_count,
                 "database_name": connection.settings_dict.get("NAME", "unknown"),
             },
         }
@@ -98,44 +151,37 @@ def check_database():
 
 
 def check_redis():
-    """Check Redis connectivity and basic operations."""
+    """Check Redis connectivity with a single PING."""
     try:
         # Get Redis URL from Celery settings
         redis_url = getattr(settings, "CELERY_BROKER_URL", "redis://localhost:6379/0")
 
-        # Connect to Redis
-        r = redis.from_url(redis_url)
+        # Reuse the shared Redis connection pool
+        r = _get_redis()
 
-        # Test basic operations
-        test_key = "health_check_test"
-        test_value = str(time.time())
+        # A single PING proves connectivity without writing to Redis
+        pong = r.ping()
 
-        # Set and get test
-        r.set(test_key, test_value, ex=10)  # Expire in 10 seconds
-        retrieved_value = r.get(test_key)
-
-        # Clean up
-        r.delete(test_key)
-
-        # Verify operation
-        if retrieved_value and retrieved_value.decode() == test_value:
+        if pong is True:
             return {
                 "status": "healthy",
                 "message": "Redis connection successful",
                 "details": {
                     "connection_test": "passed",
-                    "read_write_test": "passed",
+                    "ping_test": "passed",
                     "redis_url": redis_url.split("@")[-1] if "@" in redis_url else redis_url,  # Hide credentials
                 },
             }
         else:
             return {
                 "status": "unhealthy",
-                "message": "Redis read/write test failed",
-                "details": {"connection_test": "passed", "read_write_test": "failed"},
+                "message": "Redis ping test failed",
+                "details": {"connection_test": "passed", "ping_test": "failed"},
             }
 
     except Exception as e:
+        if isinstance(e, redis.exceptions.ConnectionError):
+            _reset_redis()
         logger.error(f"Redis health check failed: {e}")
         return {
             "status": "unhealthy",
@@ -145,18 +191,16 @@ def check_redis():
 
 
 def check_celery():
-    """Check Celery worker availability and task queue."""
+    """Check Celery worker availability from the heartbeats workers publish to Redis."""
     try:
         # Get Celery app instance
         celery_app = current_app
 
-        # Check if workers are available
-        inspect = celery_app.control.inspect()
-        active_workers = inspect.active()
+        # Read worker heartbeats instead of broadcasting an inspect request
+        worker_names = get_live_workers(_get_redis())
 
-        if active_workers:
-            worker_count = len(active_workers)
-            worker_names = list(active_workers.keys())
+        if worker_names:
+            worker_count = len(worker_names)
 
             return {
                 "status": "healthy",
@@ -175,10 +219,16 @@ def check_celery():
             return {
                 "status": "unhealthy",
                 "message": "No Celery workers available",
-                "details": {"worker_count": 0, "worker_names": [], "issue": "No active workers found"},
+                "details": {
+                    "worker_count": 0,
+                    "worker_names": [],
+                    "issue": f"No worker heartbeats in the last {HEARTBEAT_MAX_AGE} seconds",
+                },
             }
 
     except Exception as e:
+        if isinstance(e, redis.exceptions.ConnectionError):
+            _reset_redis()
         logger.error(f"Celery health check failed: {e}")
         return {
             "status": "unhealthy",
@@ -192,19 +242,15 @@ def check_application():
     try:
         from ..models import Message, TaskLog
 
-        # Check model access
-        total_messages = Message.objects.count()
-        processed_messages = Message.objects.filter(processed_at__isnull=False).count()
+        # Check model access, counting messages in a single aggregate query
+        message_counts = Message.objects.aggregate(
+            total_messages=Count("id"),
+            processed_messages=Count("id", filter=Q(processed_at__isnull=False)),
+        )
+        total_messages = message_counts["total_messages"]
+        processed_messages = message_counts["processed_messages"]
         total_tasks = TaskLog.objects.count()
 
-        # Check recent activity (last 24 hours)
-        from django.utils import timezone
-        from datetime import timedelta
-
-        recent_cutoff = timezone.now() - timedelta(hours=24)
-        recent_messages = Message.objects.filter(created_at__gte=recent_cutoff).count()
-        recent_tasks = TaskLog.objects.filter(started_at__gte=recent_cutoff).count()
-
         return {
             "status": "healthy",
             "message": "Application components working",
@@ -212,8 +258,6 @@ def check_application():
                 "total_messages": total_messages,
                 "processed_messages": processed_messages,
                 "total_tasks": total_tasks,
-                "recent_messages_24h": recent_messages,
-                "recent_tasks_24h": recent_tasks,
                 "processing_rate": round((processed_messages / total_messages * 100), 2) if total_messages > 0 else 0,
             },
         }
@@ -240,17 +284,17 @@ def readiness_check(request):
             cursor.execute("SELECT 1")
 
         # Quick Redis check
-        redis_url = getattr(settings, "CELERY_BROKER_URL", "redis://localhost:6379/0")
-        r = redis.from_url(redis_url)
-        r.ping()
+        _get_redis().ping()
 
-        return JsonResponse(
+        return _orjson_response(
             {"status": "ready", "timestamp": time.time(), "message": "Application is ready to serve traffic"}
         )
 
     except Exception as e:
+        if isinstance(e, redis.exceptions.ConnectionError):
+            _reset_redis()
         logger.error(f"Readiness check failed: {e}")
-        return JsonResponse(
+        return _orjson_response(
             {"status": "not_ready", "timestamp": time.time(), "message": f"Application not ready: {str(e)}"}, status=503
         )
 
@@ -262,4 +306,4 @@ def liveness_check(request):
     Liveness probe - checks if the application is alive and responding.
     This is the most basic check.
     """
-    return JsonResponse({"status": "alive", "timestamp": time.time(), "message": "Application is alive and responding"})
+    return HttpResponse(_LIVE_PREFIX + f"{time.time()}".encode() + _LIVE_SUFFIX, content_type="application/json")
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.24 on 2026-10-15 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("messageapp", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="tasklog",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("PENDING", "Pending"),
+                    ("STARTED", "Started"),
+                    ("SUCCESS", "Success"),
+                    ("FAILURE", "Failure"),
+                    ("RETRY", "Retry"),
+                ],
+                db_index=True,
+                default="PENDING",
+                max_length=50,
+            ),
+        ),
+    ]
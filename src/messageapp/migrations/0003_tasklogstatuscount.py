@@ -0,0 +1,46 @@
+# Generated by Django 4.2.24 on 2026-10-15 09:40
+
+from django.db import migrations, models
+
+STATUS_COUNTS_QUERY = "SELECT status, COUNT(*) AS n FROM messageapp_tasklog GROUP BY status"
+
+
+def create_status_counts_view(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"CREATE MATERIALIZED VIEW tasklog_status_counts AS {STATUS_COUNTS_QUERY}")
+        # REFRESH ... CONCURRENTLY requires a unique index on the view
+        schema_editor.execute("CREATE UNIQUE INDEX tasklog_status_counts_status ON tasklog_status_counts (status)")
+    else:
+        # Other backends (SQLite test runs) get a plain view with the same columns
+        schema_editor.execute(f"CREATE VIEW tasklog_status_counts AS {STATUS_COUNTS_QUERY}")
+
+
+def drop_status_counts_view(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("DROP MATERIALIZED VIEW IF EXISTS tasklog_status_counts")
+    else:
+        schema_editor.execute("DROP VIEW IF EXISTS tasklog_status_counts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("messageapp", "0002_alter_tasklog_status"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_status_counts_view, drop_status_counts_view),
+        migrations.CreateModel(
+            name="TaskLogStatusCount",
+            fields=[
+                ("status", models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ("n", models.BigIntegerField(help_text="Number of task logs with this status")),
+            ],
+            options={
+                "verbose_name": "Task Log Status Count",
+                "verbose_name_plural": "Task Log Status Counts",
+                "db_table": "tasklog_status_counts",
+                "managed": False,
+            },
+        ),
+    ]
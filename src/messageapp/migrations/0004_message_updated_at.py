@@ -0,0 +1,22 @@
+# Generated by Django 4.2.24 on 2026-10-15 10:05
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("messageapp", "0003_tasklogstatuscount"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="message",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True, default=django.utils.timezone.now, help_text="When the message was last modified"
+            ),
+            preserve_default=False,
+        ),
+    ]
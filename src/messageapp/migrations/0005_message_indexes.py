@@ -0,0 +1,40 @@
+# Generated by Django 4.2.24 on 2026-10-15 10:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("messageapp", "0004_message_updated_at"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="message",
+            name="task_id",
+            field=models.CharField(
+                blank=True,
+                db_index=True,
+                help_text="Celery task ID that processed this message",
+                max_length=255,
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                condition=models.Q(("processed_at__isnull", True)), fields=["-created_at"], name="msg_unprocessed_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(
+                condition=models.Q(("processed_at__isnull", False)), fields=["-created_at"], name="msg_processed_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="message",
+            index=models.Index(fields=["processed_at", "-created_at"], name="msg_processed_created_idx"),
+        ),
+    ]
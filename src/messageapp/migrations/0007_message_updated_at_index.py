@@ -0,0 +1,22 @@
+# Generated by Django 4.2.30 on 2026-10-15 22:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("messageapp", "0006_message_content_trgm"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="message",
+            name="updated_at",
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                help_text="When the message was last modified",
+            ),
+        ),
+    ]
@@ -15,13 +15,24 @@ class Message(models.Model):
         null=True, blank=True, help_text="When the message was processed by Celery task"
     )
     task_id = models.CharField(
-        max_length=255, null=True, blank=True, help_text="Celery task ID that processed this message"
+        max_length=255, null=True, blank=True, db_index=True, help_text="Celery task ID that processed this message"
     )
+    updated_at = models.DateTimeField(auto_now=True, db_index=True, help_text="When the message was last modified")
 
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Message"
         verbose_name_plural = "Messages"
+        indexes = [
+            # Partial indexes serving the unprocessed/processed API actions in created_at order
+            models.Index(
+                fields=["-created_at"], condition=models.Q(processed_at__isnull=True), name="msg_unprocessed_idx"
+            ),
+            models.Index(
+                fields=["-created_at"], condition=models.Q(processed_at__isnull=False), name="msg_processed_idx"
+            ),
+            models.Index(fields=["processed_at", "-created_at"], name="msg_processed_created_idx"),
+        ]
 
     def __str__(self):
         return f"Message: {self.content[:50]}... ({self.created_at})"
@@ -42,6 +53,7 @@ class TaskLog(models.Model):
             ("RETRY", "Retry"),
         ],
         default="PENDING",
+        db_index=True,
     )
     result = models.TextField(null=True, blank=True, help_text="Task result or error message")
     started_at = models.DateTimeField(default=timezone.now, help_text="When the task was started")
@@ -54,3 +66,19 @@ class TaskLog(models.Model):
 
     def __str__(self):
         return f"{self.task_name} ({self.status}) - {self.started_at}"
+
+
+class TaskLogStatusCount(models.Model):
+    """Per-status TaskLog counts read from the tasklog_status_counts materialized view."""
+
+    status = models.CharField(max_length=50, primary_key=True)
+    n = models.BigIntegerField(help_text="Number of task logs with this status")
+
+    class Meta:
+        managed = False
+        db_table = "tasklog_status_counts"
+        verbose_name = "Task Log Status Count"
+        verbose_name_plural = "Task Log Status Counts"
+
+    def __str__(self):
+        return f"{self.status}: {self.n}"
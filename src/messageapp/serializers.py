@@ -5,6 +5,9 @@ API serializers for the messageapp.
 from rest_framework import serializers
 from .models import Message, TaskLog
 
+# Maximum number of message ids accepted by a single bulk processing request
+BULK_PROCESS_MAX_IDS = 1000
+
 
 class MessageSerializer(serializers.ModelSerializer):
     """Serializer for Message model."""
@@ -15,6 +18,17 @@ class MessageSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at", "processed_at", "task_id"]
 
 
+class MessageListSerializer(serializers.ModelSerializer):
+    """Lightweight serializer for Message listings that returns a content preview instead of the full text."""
+
+    content_preview = serializers.CharField(read_only=True)
+
+    class Meta:
+        model = Message
+        fields = ["id", "content_preview", "created_at", "processed_at", "task_id"]
+        read_only_fields = ["id", "created_at", "processed_at", "task_id"]
+
+
 class MessageCreateSerializer(serializers.ModelSerializer):
     """Serializer for creating new messages."""
 
@@ -23,6 +37,14 @@ class MessageCreateSerializer(serializers.ModelSerializer):
         fields = ["content"]
 
 
+class MessageBulkProcessSerializer(serializers.Serializer):
+    """Serializer for validating a bulk message processing request."""
+
+    message_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_PROCESS_MAX_IDS
+    )
+
+
 class TaskLogSerializer(serializers.ModelSerializer):
     """Serializer for TaskLog model."""
 
@@ -30,3 +52,12 @@ class TaskLogSerializer(serializers.ModelSerializer):
         model = TaskLog
         fields = ["id", "task_name", "task_id", "status", "result", "started_at", "completed_at"]
         read_only_fields = ["id", "started_at", "completed_at"]
+
+
+class TaskLogListSerializer(serializers.ModelSerializer):
+    """Serializer for TaskLog list views, leaving out the potentially large result text."""
+
+    class Meta:
+        model = TaskLog
+        fields = ["id", "task_name", "task_id", "status", "started_at", "completed_at"]
+        read_only_fields = fields
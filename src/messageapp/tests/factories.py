@@ -0,0 +1,10 @@
+"""
+Batch fixture builders shared across the test modules.
+"""
+
+from ..models import Message
+
+
+def make_messages(n, prefix="Test message"):
+    """Create n messages with numbered content in a single INSERT and return them."""
+    return Message.objects.bulk_create([Message(content=f"{prefix} {i}") for i in range(n)])
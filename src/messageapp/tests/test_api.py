@@ -2,26 +2,31 @@
 Unit tests for messageapp API endpoints.
 """
 
-from rest_framework.test import APITestCase, APIClient
+from django.utils import timezone
+from rest_framework.test import APISimpleTestCase, APITestCase
 from rest_framework import status
 from unittest.mock import patch, MagicMock
 from ..models import Message, TaskLog
+from ..serializers import BULK_PROCESS_MAX_IDS
+from ..tasks import refresh_tasklog_stats
+from .factories import make_messages
 
 
 class MessageAPITest(APITestCase):
     """Test cases for Message API endpoints."""
 
-    def setUp(self):
-        """Set up test data and client."""
-        self.client = APIClient()
-        self.message_data = {"content": "Test API message content"}
-        self.message = Message.objects.create(content="Existing test message")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.message_data = {"content": "Test API message content"}
+        cls.message = Message.objects.create(content="Existing test message")
 
     def test_create_message(self):
         """Test creating a message via API."""
         response = self.client.post("/api/messages/", self.message_data, format="json")
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
-        self.assertEqual(Message.objects.count(), 2)  # setUp creates one, this creates another
+        self.assertTrue(response["Content-Type"].startswith("application/json"))
+        self.assertEqual(Message.objects.count(), 2)  # setUpTestData creates one, this creates another
 
     def test_list_messages(self):
         """Test listing all messages."""
@@ -34,6 +39,21 @@ class MessageAPITest(APITestCase):
         else:
             self.assertGreaterEqual(len(response.data), 1)
 
+    def test_list_messages_etag(self):
+        """Test that an unchanged message list answers 304 Not Modified."""
+        response = self.client.get("/api/messages/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("ETag", response)
+        etag = response["ETag"]
+
+        response = self.client.get("/api/messages/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        # Any change to the messages invalidates the ETag
+        Message.objects.create(content="Another message")
+        response = self.client.get("/api/messages/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_retrieve_message(self):
         """Test retrieving a specific message."""
         response = self.client.get(f"/api/messages/{self.message.id}/")
@@ -94,6 +114,58 @@ class MessageAPITest(APITestCase):
         self.assertIn("task_id", response.data)
         mock_delay.assert_called_once_with(self.message.id)
 
+    def test_unprocessed_messages(self):
+        """Test unprocessed messages are paginated and return a preview instead of the full content."""
+        Message.objects.create(content="Processed message", processed_at=timezone.now())
+
+        response = self.client.get("/api/messages/unprocessed/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 1)
+
+        result = response.data["results"][0]
+        self.assertEqual(result["id"], self.message.id)
+        self.assertEqual(result["content_preview"], "Existing test message")
+        self.assertNotIn("content", result)
+
+    def test_search_messages(self):
+        """Test searching messages by content."""
+        Message.objects.create(content="Unrelated content")
+
+        response = self.client.get("/api/messages/search/", {"q": "existing"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["query"], "existing")
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["results"][0]["id"], self.message.id)
+
+    @patch("messageapp.api.views.process_messages")
+    def test_process_messages_bulk(self, mock_process_messages):
+        """Test processing several messages with a single bulk submission."""
+        other_message = Message.objects.create(content="Another test message")
+
+        response = self.client.post(
+            "/api/messages/process_bulk/", {"message_ids": [self.message.id, other_message.id, 99999]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Unknown ids are dropped before dispatch
+        self.assertCountEqual(response.data["message_ids"], [self.message.id, other_message.id])
+        mock_process_messages.assert_called_once()
+        self.assertCountEqual(mock_process_messages.call_args.args[0], [self.message.id, other_message.id])
+
+    def test_process_messages_bulk_invalid_data(self):
+        """Test bulk processing rejects an empty id list."""
+        response = self.client.post("/api/messages/process_bulk/", {"message_ids": []}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @patch("messageapp.api.views.process_messages")
+    def test_process_messages_bulk_too_many_ids(self, mock_process_messages):
+        """Test bulk processing rejects more ids than one request may dispatch."""
+        message_ids = list(range(1, BULK_PROCESS_MAX_IDS + 2))
+
+        response = self.client.post("/api/messages/process_bulk/", {"message_ids": message_ids}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_process_messages.assert_not_called()
+
     def test_process_nonexistent_message_async(self):
         """Test processing a nonexistent message asynchronously."""
         response = self.client.post("/api/messages/99999/process_async/")
@@ -103,10 +175,10 @@ class MessageAPITest(APITestCase):
 class TaskLogAPITest(APITestCase):
     """Test cases for TaskLog API endpoints."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.client = APIClient()
-        self.task_log = TaskLog.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.task_log = TaskLog.objects.create(
             task_id="test-task-123", task_name="test_task", status="SUCCESS", result="Task completed successfully"
         )
 
@@ -121,6 +193,24 @@ class TaskLogAPITest(APITestCase):
         else:
             self.assertGreaterEqual(len(response.data), 1)
 
+    def test_task_log_list_query_count(self):
+        """Test that the task log list stays within its query budget."""
+        TaskLog.objects.bulk_create(
+            [TaskLog(task_id=f"budget-task-{i}", task_name="test_task", status="SUCCESS") for i in range(5)]
+        )
+
+        # One COUNT for pagination plus one page SELECT, regardless of row count
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/task-logs/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_list_task_logs_omit_result(self):
+        """Test that list views leave out the result text, which stays available on detail."""
+        response = self.client.get("/api/task-logs/recent/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("status", response.data[0])
+        self.assertNotIn("result", response.data[0])
+
     def test_retrieve_task_log(self):
         """Test retrieving a specific task log."""
         response = self.client.get(f"/api/task-logs/{self.task_log.id}/")
@@ -142,7 +232,9 @@ class TaskLogAPITest(APITestCase):
         TaskLog.objects.create(task_id="test-task-456", task_name="test_task", status="FAILURE")
         TaskLog.objects.create(task_id="test-task-789", task_name="test_task", status="STARTED")
 
-        response = self.client.get("/api/task-logs/?status=SUCCESS")
+        # Paginated list: one COUNT plus one page SELECT
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/task-logs/?status=SUCCESS")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Check if response is paginated
@@ -155,7 +247,8 @@ class TaskLogAPITest(APITestCase):
         # Create additional task logs with different task names
         TaskLog.objects.create(task_id="test-task-456", task_name="different_task", status="SUCCESS")
 
-        response = self.client.get("/api/task-logs/?task_name=test_task")
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/task-logs/?task_name=test_task")
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
         # Check if response is paginated
@@ -163,16 +256,28 @@ class TaskLogAPITest(APITestCase):
         for task_log in results:
             self.assertEqual(task_log["task_name"], "test_task")
 
+    def test_task_log_stats(self):
+        """Test task statistics are read from the refreshed status counts."""
+        TaskLog.objects.create(task_id="test-task-456", task_name="test_task", status="FAILURE")
+        refresh_tasklog_stats()
+
+        response = self.client.get("/api/task-logs/stats/")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["total_tasks"], 2)
+        self.assertEqual(response.data["completed_tasks"], 1)
+        self.assertEqual(response.data["failed_tasks"], 1)
+        self.assertEqual(response.data["pending_tasks"], 0)
+        self.assertEqual(response.data["success_rate"], 50.0)
+
 
 class APIPaginationTest(APITestCase):
     """Test cases for API pagination."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.client = APIClient()
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
         # Create multiple messages for pagination testing
-        for i in range(15):
-            Message.objects.create(content=f"Test message {i}")
+        make_messages(15)
 
     def test_message_list_pagination(self):
         """Test that message list is paginated."""
@@ -200,10 +305,6 @@ class APIPaginationTest(APITestCase):
 class APIErrorHandlingTest(APITestCase):
     """Test cases for API error handling."""
 
-    def setUp(self):
-        """Set up test client."""
-        self.client = APIClient()
-
     def test_invalid_json_request(self):
         """Test handling of invalid JSON in request."""
         response = self.client.post(
@@ -217,41 +318,24 @@ class APIErrorHandlingTest(APITestCase):
         response = self.client.patch("/api/messages/", {}, format="json")
         self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
 
-    def test_content_type_handling(self):
-        """Test different content types are handled correctly."""
-        message_data = {"content": "Test message"}
-
-        # Test JSON content type
-        response = self.client.post("/api/messages/", message_data, format="json")
-        self.assertIn(response.status_code, [status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST])
-
 
 class APIPerformanceTest(APITestCase):
     """Test cases for API performance."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.client = APIClient()
-
     def test_bulk_operations_performance(self):
         """Test that bulk operations don't cause excessive queries."""
         # Create multiple messages
-        messages = [Message(content=f"Bulk message {i}") for i in range(10)]
-        Message.objects.bulk_create(messages)
+        make_messages(10, prefix="Bulk message")
 
-        # Test that listing doesn't cause N+1 queries
-        with self.assertNumQueries(2):  # Reasonable number of queries
+        # Test that listing doesn't cause N+1 queries (ETag aggregate, page count, page rows)
+        with self.assertNumQueries(3):
             response = self.client.get("/api/messages/")
             self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
-class APIRootTest(APITestCase):
+class APIRootTest(APISimpleTestCase):
     """Test cases for API root endpoint."""
 
-    def setUp(self):
-        """Set up test client."""
-        self.client = APIClient()
-
     def test_api_root(self):
         """Test API root endpoint returns expected links."""
         response = self.client.get("/api/")
@@ -2,7 +2,7 @@
 Unit tests for messageapp models.
 """
 
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from django.db import IntegrityError
@@ -12,9 +12,10 @@ from ..models import Message, TaskLog
 class MessageModelTest(TestCase):
     """Test cases for the Message model."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.message_data = {"content": "Test message content"}
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.message_data = {"content": "Test message content"}
 
     def test_message_creation(self):
         """Test creating a message with valid data."""
@@ -25,12 +26,6 @@ class MessageModelTest(TestCase):
         self.assertIsNone(message.processed_at)
         self.assertTrue(message.id)
 
-    def test_message_str_representation(self):
-        """Test the string representation of a message."""
-        message = Message.objects.create(**self.message_data)
-        expected_str = f"Message: {message.content[:50]}... ({message.created_at})"
-        self.assertEqual(str(message), expected_str)
-
     def test_message_content_required(self):
         """Test that content field is required."""
         with self.assertRaises(IntegrityError):
@@ -93,10 +88,10 @@ class MessageModelTest(TestCase):
 class TaskLogModelTest(TestCase):
     """Test cases for the TaskLog model."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.message = Message.objects.create(content="Test message for task")
-        self.task_data = {"task_id": "test-task-123", "task_name": "process_message_task", "status": "PENDING"}
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.task_data = {"task_id": "test-task-123", "task_name": "process_message_task", "status": "PENDING"}
 
     def test_task_log_creation(self):
         """Test creating a task log with valid data."""
@@ -109,34 +104,12 @@ class TaskLogModelTest(TestCase):
         self.assertIsNone(task_log.completed_at)
         self.assertIsNone(task_log.result)
 
-    def test_task_log_str_representation(self):
-        """Test the string representation of a task log."""
-        task_log = TaskLog.objects.create(**self.task_data)
-        expected_str = f"process_message_task (PENDING) - {task_log.started_at}"
-        self.assertEqual(str(task_log), expected_str)
-
     def test_task_log_required_fields(self):
         """Test that required fields are enforced."""
         # Test missing task_id (which has unique=True constraint)
         with self.assertRaises(IntegrityError):
             TaskLog.objects.create(task_name="test_task", task_id=None, status="PENDING")
 
-    def test_task_log_status_choices(self):
-        """Test task status choices validation."""
-        valid_statuses = ["PENDING", "STARTED", "SUCCESS", "FAILURE", "RETRY"]
-
-        for status in valid_statuses:
-            task_log = TaskLog(task_id=f"test-{status.lower()}", task_name="test_task", status=status)
-            # Should not raise validation error
-            task_log.full_clean()
-
-    def test_task_log_invalid_status(self):
-        """Test that invalid status raises validation error."""
-        task_log = TaskLog(task_id="test-invalid", task_name="test_task", status="INVALID_STATUS")
-
-        with self.assertRaises(ValidationError):
-            task_log.full_clean()
-
     def test_task_log_completion(self):
         """Test completing a task log."""
         task_log = TaskLog.objects.create(**self.task_data)
@@ -148,10 +121,9 @@ class TaskLogModelTest(TestCase):
         task_log.result = "Task completed successfully"
         task_log.save()
 
-        task_log.refresh_from_db()
-        self.assertEqual(task_log.status, "SUCCESS")
-        self.assertEqual(task_log.completed_at, completion_time)
-        self.assertEqual(task_log.result, "Task completed successfully")
+        # Read the stored values back in one query to check save() wrote them
+        stored = TaskLog.objects.values_list("status", "completed_at", "result").get(pk=task_log.pk)
+        self.assertEqual(stored, ("SUCCESS", completion_time, "Task completed successfully"))
 
     def test_task_log_failure(self):
         """Test failing a task log."""
@@ -163,10 +135,13 @@ class TaskLogModelTest(TestCase):
         task_log.result = "Task failed due to error"
         task_log.save()
 
-        task_log.refresh_from_db()
-        self.assertEqual(task_log.status, "FAILURE")
-        self.assertIsNotNone(task_log.completed_at)
-        self.assertEqual(task_log.result, "Task failed due to error")
+        # Read the stored values back in one query to check save() wrote them
+        status, completed_at, result = TaskLog.objects.values_list("status", "completed_at", "result").get(
+            pk=task_log.pk
+        )
+        self.assertEqual(status, "FAILURE")
+        self.assertIsNotNone(completed_at)
+        self.assertEqual(result, "Task failed due to error")
 
     def test_task_log_ordering(self):
         """Test that task logs are ordered by start time."""
@@ -187,6 +162,42 @@ class TaskLogModelTest(TestCase):
             TaskLog.objects.create(**self.task_data)
 
 
+class MessageModelPureTest(SimpleTestCase):
+    """Test cases for Message behavior that needs no database, using unsaved instances."""
+
+    def test_message_str_representation(self):
+        """Test the string representation of a message."""
+        message = Message(content="Test message content")
+        expected_str = f"Message: {message.content[:50]}... ({message.created_at})"
+        self.assertEqual(str(message), expected_str)
+
+
+class TaskLogModelPureTest(SimpleTestCase):
+    """Test cases for TaskLog behavior that needs no database, using unsaved instances."""
+
+    def test_task_log_str_representation(self):
+        """Test the string representation of a task log."""
+        task_log = TaskLog(task_id="test-task-123", task_name="process_message_task", status="PENDING")
+        expected_str = f"process_message_task (PENDING) - {task_log.started_at}"
+        self.assertEqual(str(task_log), expected_str)
+
+    def test_task_log_status_choices(self):
+        """Test task status choices validation."""
+        valid_statuses = ["PENDING", "STARTED", "SUCCESS", "FAILURE", "RETRY"]
+
+        for status in valid_statuses:
+            task_log = TaskLog(task_id=f"test-{status.lower()}", task_name="test_task", status=status)
+            # Should not raise validation error; uniqueness needs the database and is covered elsewhere
+            task_log.full_clean(validate_unique=False)
+
+    def test_task_log_invalid_status(self):
+        """Test that invalid status raises validation error."""
+        task_log = TaskLog(task_id="test-invalid", task_name="test_task", status="INVALID_STATUS")
+
+        with self.assertRaises(ValidationError):
+            task_log.full_clean(validate_unique=False)
+
+
 class ModelIntegrationTest(TestCase):
     """Integration tests for model interactions."""
 
@@ -210,9 +221,6 @@ class ModelIntegrationTest(TestCase):
         # Verify creation
         self.assertEqual(Message.objects.count(), 5)
 
-        # Test bulk update
-        Message.objects.filter(content__startswith="Bulk").update(processed_at=timezone.now())
-
-        # Verify all are processed
-        processed_count = Message.objects.filter(processed_at__isnull=False).count()
-        self.assertEqual(processed_count, 5)
+        # Test bulk update; update() returns the number of rows it changed
+        updated = Message.objects.filter(content__startswith="Bulk").update(processed_at=timezone.now())
+        self.assertEqual(updated, 5)
@@ -5,16 +5,23 @@ Unit tests for Celery tasks.
 from django.test import TestCase
 from django.utils import timezone
 from unittest.mock import patch
+from celery.exceptions import Retry
 from ..models import Message, TaskLog
-from ..tasks import process_message_task, periodic_message_task
+from ..tasks import PROCESSING_DELAY_SECONDS, process_message_task, process_messages, periodic_message_task
+from .factories import make_messages
 
 
-class ProcessMessageTaskTest(TestCase):
-    """Test cases for process_message_task."""
+class SeededMessageTestCase(TestCase):
+    """Base class seeding one message per test class; per-test rollback undoes any changes to it."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.message = Message.objects.create(content="Test message for processing")
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.message = Message.objects.create(content="Task test message")
+
+
+class ProcessMessageTaskTest(SeededMessageTestCase):
+    """Test cases for process_message_task."""
 
     @patch("messageapp.tasks.process_message_task.retry")
     def test_process_message_success(self, mock_retry):
@@ -28,9 +35,8 @@ class ProcessMessageTaskTest(TestCase):
         self.message.refresh_from_db()
         self.assertIsNotNone(self.message.processed_at)
 
-        # Verify task log was created
-        task_log = TaskLog.objects.latest("started_at")
-        self.assertIsNotNone(task_log)
+        # Verify task log was created under the task id recorded on the message
+        task_log = TaskLog.objects.get(task_id=self.message.task_id)
         self.assertEqual(task_log.status, "SUCCESS")
         self.assertEqual(task_log.task_name, "process_message_task")
 
@@ -43,17 +49,19 @@ class ProcessMessageTaskTest(TestCase):
         self.assertIn("Message with id 99999 not found", str(context.exception))
 
     @patch("messageapp.tasks.process_message_task.retry")
-    @patch("time.sleep")
-    def test_process_message_with_simulated_delay(self, mock_sleep, mock_retry):
-        """Test message processing with simulated processing time."""
-        # The task includes a sleep - we mock it to speed up tests
-        result = process_message_task(self.message.id)
+    def test_process_message_with_simulated_delay(self, mock_retry):
+        """Test that the first delivery re-queues itself for the simulated processing time."""
+        mock_retry.side_effect = Retry()
 
-        # Verify sleep was called (simulating processing time)
-        mock_sleep.assert_called_once()
+        result = process_message_task.apply(args=(self.message.id,))
 
-        # Verify successful processing
-        self.assertEqual(result, f"Message {self.message.id} processed successfully")
+        # Verify the delay is served by a countdown rather than by sleeping
+        mock_retry.assert_called_once_with(countdown=PROCESSING_DELAY_SECONDS, max_retries=1)
+        self.assertEqual(result.state, "RETRY")
+
+        # The message is only processed on the retried delivery
+        self.message.refresh_from_db()
+        self.assertIsNone(self.message.processed_at)
 
     @patch("messageapp.tasks.process_message_task.retry")
     def test_process_already_processed_message(self, mock_retry):
@@ -67,11 +75,11 @@ class ProcessMessageTaskTest(TestCase):
         # Should still return success
         self.assertEqual(result, f"Message {self.message.id} processed successfully")
 
-    @patch("messageapp.models.Message.objects.get")
-    def test_process_message_database_error(self, mock_get):
+    @patch("messageapp.models.Message.objects.filter")
+    def test_process_message_database_error(self, mock_filter):
         """Test handling of database errors during processing."""
         # Mock database error
-        mock_get.side_effect = Exception("Database connection lost")
+        mock_filter.side_effect = Exception("Database connection lost")
 
         with self.assertRaises(Exception) as context:
             process_message_task(self.message.id)
@@ -79,11 +87,38 @@ class ProcessMessageTaskTest(TestCase):
         # Verify the exception message
         self.assertIn("Database connection lost", str(context.exception))
 
-        # Verify task log shows failure
-        task_log = TaskLog.objects.latest("started_at")
+        # Verify task log shows failure; a failed run never records its task id on the message,
+        # but it is the only task log in the test
+        task_log = TaskLog.objects.get()
         self.assertEqual(task_log.status, "FAILURE")
 
 
+class ProcessMessagesTest(TestCase):
+    """Test cases for bulk dispatch through process_messages."""
+
+    def setUp(self):
+        """Run dispatched tasks eagerly, in process, for the duration of each test."""
+        conf = process_message_task.app.conf
+        self.addCleanup(setattr, conf, "task_always_eager", conf.task_always_eager)
+        conf.task_always_eager = True
+
+    def test_missing_message_does_not_stop_the_rest(self):
+        """Test that every other message is processed under its own task id when one id is missing."""
+        first, second = make_messages(2, prefix="Bulk message")
+
+        process_messages([first.id, 99999, second.id])
+
+        for message in (first, second):
+            message.refresh_from_db()
+            self.assertIsNotNone(message.processed_at)
+            self.assertFalse(message.task_id.startswith("test-"))
+            self.assertEqual(TaskLog.objects.get(task_id=message.task_id).status, "SUCCESS")
+
+        failed = TaskLog.objects.get(status="FAILURE")
+        self.assertIn("Message with id 99999 not found", failed.result)
+        self.assertNotIn(failed.task_id, {first.task_id, second.task_id})
+
+
 class PeriodicMessageTaskTest(TestCase):
     """Test cases for periodic_message_task."""
 
@@ -124,11 +159,11 @@ class PeriodicMessageTaskTest(TestCase):
         self.assertEqual(Message.objects.count(), initial_count + 3)
 
         # Verify they have different timestamps
-        periodic_messages = Message.objects.filter(
-            content__startswith="System message created by periodic task"
-        ).order_by("created_at")
-
-        contents = [msg.content for msg in list(periodic_messages)[-3:]]
+        contents = (
+            Message.objects.filter(content__startswith="System message created by periodic task")
+            .order_by("-created_at")
+            .values_list("content", flat=True)[:3]
+        )
         self.assertEqual(len(set(contents)), 3)  # All should be unique
 
     @patch("messageapp.models.Message.objects.create")
@@ -141,21 +176,17 @@ class PeriodicMessageTaskTest(TestCase):
             periodic_message_task()
 
 
-class TaskIntegrationTest(TestCase):
+class TaskIntegrationTest(SeededMessageTestCase):
     """Integration tests for task functionality."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.message = Message.objects.create(content="Integration test message")
-
     def test_task_log_creation_and_updates(self):
         """Test that task logs are properly created and updated."""
         # Process the message
         process_message_task(self.message.id)
+        self.message.refresh_from_db()
 
-        # Verify task log was created
-        task_log = TaskLog.objects.latest("started_at")
-        self.assertIsNotNone(task_log)
+        # Verify task log was created under the task id recorded on the message
+        task_log = TaskLog.objects.get(task_id=self.message.task_id)
         self.assertEqual(task_log.task_name, "process_message_task")
         self.assertEqual(task_log.status, "SUCCESS")
         self.assertIsNotNone(task_log.task_id)  # Should have a generated task ID
@@ -179,9 +210,8 @@ class TaskIntegrationTest(TestCase):
 
         # Verify task log was created
         self.assertEqual(TaskLog.objects.count(), initial_task_count + 1)
-        task_log = TaskLog.objects.latest("started_at")
+        task_log = TaskLog.objects.get(task_id=self.message.task_id)
         self.assertEqual(task_log.status, "SUCCESS")
-        self.assertEqual(task_log.task_id, self.message.task_id)
 
     def test_periodic_and_process_task_interaction(self):
         """Test interaction between periodic task and process task."""
@@ -214,26 +244,22 @@ class TaskIntegrationTest(TestCase):
             self.assertEqual(task_log.status, "SUCCESS")
 
 
-class TaskErrorHandlingTest(TestCase):
+class TaskErrorHandlingTest(SeededMessageTestCase):
     """Test cases for task error handling."""
 
-    def setUp(self):
-        """Set up test data."""
-        self.message = Message.objects.create(content="Error handling test message")
-
-    @patch("time.sleep")
-    @patch("messageapp.models.Message.save")
-    def test_task_retry_mechanism(self, mock_save, mock_sleep):
+    @patch("django.db.models.query.QuerySet.update")
+    def test_task_retry_mechanism(self, mock_update):
         """Test task retry mechanism on transient errors."""
         # Mock a transient error on first call, success on second
-        mock_save.side_effect = [Exception("Transient error"), None]
+        mock_update.side_effect = [Exception("Transient error"), 1]
 
         # This should fail due to the exception
         with self.assertRaises(Exception):
             process_message_task(self.message.id)
 
-        # Verify task log shows failure
-        task_log = TaskLog.objects.latest("started_at")
+        # Verify task log shows failure; a failed run never records its task id on the message,
+        # but it is the only task log in the test
+        task_log = TaskLog.objects.get()
         self.assertEqual(task_log.status, "FAILURE")
         self.assertIn("Transient error", task_log.result)
 
@@ -245,10 +271,5 @@ class TaskErrorHandlingTest(TestCase):
         # Verify info logging occurred
         mock_logger.info.assert_called()
 
-        # Check log message content
-        log_calls = mock_logger.info.call_args_list
-        log_messages = [call[0][0] for call in log_calls]
-
         # Should log successful processing
-        success_logs = [msg for msg in log_messages if "Successfully processed" in msg]
-        self.assertGreater(len(success_logs), 0)
+        self.assertTrue(any("Successfully processed" in call.args[0] for call in mock_logger.info.call_args_list))
@@ -0,0 +1,83 @@
+"""
+Unit tests for the template and status views.
+"""
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from ..models import Message, TaskLog
+from ..views import MESSAGE_PREVIEW_LENGTH
+from .factories import make_messages
+
+
+class ViewQueryCountTest(TestCase):
+    """Query count regression guards for the home and status views."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Seed enough rows that a per-row query would show up in the counts."""
+        make_messages(5)
+        TaskLog.objects.bulk_create(
+            [TaskLog(task_id=f"view-task-{i}", task_name="process_message_task", status="SUCCESS") for i in range(5)]
+        )
+
+    def test_home_query_count(self):
+        """Test that the home page loads counts, messages and recent tasks in one query each."""
+        with self.assertNumQueries(3):
+            response = self.client.get("/")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["total_messages"], 5)
+
+    def test_status_query_count(self):
+        """Test that the status endpoint loads counts and recent tasks in one query each."""
+        with self.assertNumQueries(2):
+            response = self.client.get("/status/")
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["total_messages"], 5)
+        self.assertEqual(len(data["recent_tasks"]), 5)
+
+    def test_home_loads_content_preview_only(self):
+        """Test that the home page fetches a truncated preview instead of the full message content."""
+        Message.objects.create(content="x" * 10000)
+
+        with self.assertNumQueries(3):
+            response = self.client.get("/")
+
+        newest = response.context["messages"][0]
+        self.assertIn("content", newest.get_deferred_fields())
+        self.assertEqual(len(newest.preview), MESSAGE_PREVIEW_LENGTH + 1)
+        self.assertContains(response, "x" * (MESSAGE_PREVIEW_LENGTH - 1) + "…")
+        self.assertNotContains(response, "x" * MESSAGE_PREVIEW_LENGTH)
+
+
+class MessageAdminTest(TestCase):
+    """Test cases for the Message admin querysets."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.user = User.objects.create_superuser("admin", "admin@example.com", "password")
+        cls.message = Message.objects.create(content="y" * 500)
+
+    def setUp(self):
+        """Log in as the superuser without running the password check."""
+        self.client.force_login(self.user)
+
+    def test_changelist_defers_content(self):
+        """Test that the changelist loads a content preview instead of the full content."""
+        response = self.client.get(reverse("admin:messageapp_message_changelist"))
+
+        self.assertEqual(response.status_code, 200)
+        listed = response.context["cl"].result_list[0]
+        self.assertIn("content", listed.get_deferred_fields())
+        self.assertContains(response, "y" * 100 + "...")
+
+    def test_change_form_loads_content(self):
+        """Test that the change form fetches content with the row instead of in a deferred query."""
+        response = self.client.get(reverse("admin:messageapp_message_change", args=[self.message.pk]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["original"].get_deferred_fields(), set())
@@ -4,16 +4,30 @@ Views for the messages app.
 
 from django.shortcuts import render, redirect
 from django.contrib import messages as django_messages
+from django.db.models import Count, Q
+from django.db.models.functions import Substr
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from .models import Message, TaskLog
 from .tasks import process_message_task
 from .forms import MessageForm
 
+# The home page lists at most this many messages, showing this many characters of each
+HOME_MESSAGE_LIMIT = 100
+MESSAGE_PREVIEW_LENGTH = 80
+
+
+def _message_counts():
+    """Return total and processed message counts from a single aggregate query."""
+    return Message.objects.aggregate(
+        total_messages=Count("id"),
+        processed_messages=Count("id", filter=Q(processed_at__isnull=False)),
+    )
+
 
 def home(request):
     """
-    Home page view that displays the message form and all messages.
+    Home page view that displays the message form and the newest messages.
     """
     if request.method == "POST":
         form = MessageForm(request.POST)
@@ -29,18 +43,21 @@ def home(request):
     else:
         form = MessageForm()
 
-    # Get all messages ordered by creation date (newest first)
-    all_messages = Message.objects.all()
+    # Get the newest messages, fetching only a content preview one character longer than shown,
+    # so the template can tell when to add an ellipsis
+    all_messages = Message.objects.annotate(preview=Substr("content", 1, MESSAGE_PREVIEW_LENGTH + 1)).only(
+        "id", "created_at", "processed_at", "task_id"
+    )[:HOME_MESSAGE_LIMIT]
 
     # Get recent task logs for display
-    recent_tasks = TaskLog.objects.all()[:10]
+    recent_tasks = TaskLog.objects.values("task_name", "status", "started_at")[:10]
 
     context = {
         "form": form,
         "messages": all_messages,
+        "preview_length": MESSAGE_PREVIEW_LENGTH,
         "recent_tasks": recent_tasks,
-        "total_messages": all_messages.count(),
-        "processed_messages": all_messages.filter(processed_at__isnull=False).count(),
+        **_message_counts(),
     }
 
     return render(request, "messages/home.html", context)
@@ -51,11 +68,12 @@ def status(request):
     """
     API endpoint to get current status of messages and tasks.
     """
-    total_messages = Message.objects.count()
-    processed_messages = Message.objects.filter(processed_at__isnull=False).count()
+    counts = _message_counts()
+    total_messages = counts["total_messages"]
+    processed_messages = counts["processed_messages"]
     pending_messages = total_messages - processed_messages
 
-    recent_tasks = TaskLog.objects.all()[:5]
+    recent_tasks = TaskLog.objects.values("task_name", "status", "started_at", "result")[:5]
 
     return JsonResponse(
         {
@@ -64,10 +82,10 @@ def status(request):
             "pending_messages": pending_messages,
             "recent_tasks": [
                 {
-                    "task_name": task.task_name,
-                    "status": task.status,
-                    "started_at": task.started_at.isoformat(),
-                    "result": task.result[:100] if task.result else None,
+                    "task_name": task["task_name"],
+                    "status": task["status"],
+                    "started_at": task["started_at"].isoformat(),
+                    "result": task["result"][:100] if task["result"] else None,
                 }
                 for task in recent_tasks
             ],
@@ -6,8 +6,11 @@ This script runs the Django test suite and provides detailed output for CI/CD in
 
 import os
 import sys
+import time
+import unittest
 import django
 from django.conf import settings
+from django.test.runner import get_max_test_processes, parallel_type
 from django.test.utils import get_runner
 import json
 from datetime import datetime
@@ -19,7 +22,7 @@ def setup_django():
     django.setup()
 
 
-def run_tests(verbosity=2, pattern=None, failfast=False):
+def run_tests(verbosity=2, pattern=None, failfast=False, keepdb=True, parallel=0):
     """
     Run Django tests with specified options.
 
@@ -27,12 +30,18 @@ def run_tests(verbosity=2, pattern=None, failfast=False):
         verbosity (int): Verbosity level (0-3)
         pattern (str): Test pattern to match
         failfast (bool): Stop on first failure
+        keepdb (bool): Reuse an existing test database instead of recreating it and rerunning migrations
+        parallel (int or str): Number of test processes, or "auto" for one per CPU core; 0 runs serially
 
     Returns:
         dict: Test results summary
     """
     TestRunner = get_runner(settings)
-    test_runner = TestRunner(verbosity=verbosity, interactive=False, failfast=failfast)
+    if parallel == "auto":
+        parallel = get_max_test_processes()
+    test_runner = TestRunner(
+        verbosity=verbosity, interactive=False, failfast=failfast, keepdb=keepdb, parallel=parallel
+    )
 
     # Determine which tests to run
     test_labels = []
@@ -61,7 +70,7 @@ def run_tests(verbosity=2, pattern=None, failfast=False):
     }
 
 
-def run_coverage_tests():
+def run_coverage_tests(keepdb=True):
     """Run tests with coverage reporting if coverage is available."""
     try:
         import coverage
@@ -69,12 +78,17 @@ def run_coverage_tests():
         print("Running tests with coverage...")
         print("=" * 70)
 
-        # Start coverage
-        cov = coverage.Coverage()
+        # Python 3.12+ can trace through sys.monitoring (PEP 669), which is much cheaper than settrace;
+        # coverage 7.4+ picks this up from COVERAGE_CORE
+        if sys.version_info >= (3, 12):
+            os.environ.setdefault("COVERAGE_CORE", "sysmon")
+
+        # Start coverage, reading source and omit settings from .coveragerc
+        cov = coverage.Coverage(config_file=True)
         cov.start()
 
         # Run tests
-        result = run_tests(verbosity=1)
+        result = run_tests(verbosity=1, keepdb=keepdb)
 
         # Stop coverage and generate report
         cov.stop()
@@ -82,40 +96,89 @@ def run_coverage_tests():
 
         print("\nCoverage Report:")
         print("-" * 50)
-        cov.report(show_missing=True)
+        cov.report()
 
         return result
 
     except ImportError:
         print("Coverage not available, running tests without coverage...")
-        return run_tests()
+        return run_tests(keepdb=keepdb)
+
 
+def run_specific_test_categories(keepdb=True):
+    """
+    Run tests by category for detailed reporting.
 
-def run_specific_test_categories():
-    """Run tests by category for detailed reporting."""
+    All categories run in a single test run, so the test database is set up once. Per-category
+    results are tallied from the individual test outcomes; durations cover the test methods
+    only, not class-level fixtures.
+    """
     categories = {
-        "models": "messageapp.test_models",
-        "api": "messageapp.test_api",
-        "health": "messageapp.test_health",
-        "tasks": "messageapp.test_tasks",
+        "models": "messageapp.tests.test_models",
+        "api": "messageapp.tests.test_api",
+        "health": "messageapp.tests.test_health",
+        "tasks": "messageapp.tests.test_tasks",
+        "views": "messageapp.tests.test_views",
     }
+    durations = dict.fromkeys(categories, 0.0)
+    failures = dict.fromkeys(categories, 0)
 
-    results = {}
-    total_failures = 0
+    def category_of(test):
+        return next((category for category, module in categories.items() if module in test.id()), None)
+
+    class CategoryResult(unittest.TextTestResult):
+        def startTest(self, test):
+            self._test_started = time.perf_counter()
+            super().startTest(test)
+
+        def stopTest(self, test):
+            super().stopTest(test)
+            category = category_of(test)
+            if category:
+                durations[category] += time.perf_counter() - self._test_started
+
+        def addError(self, test, err):
+            super().addError(test, err)
+            self._count_failure(test)
+
+        def addFailure(self, test, err):
+            super().addFailure(test, err)
+            self._count_failure(test)
+
+        def addSubTest(self, test, subtest, err):
+            super().addSubTest(test, subtest, err)
+            if err is not None:
+                self._count_failure(test)
+
+        def _count_failure(self, test):
+            category = category_of(test)
+            if category:
+                failures[category] += 1
+
+    TestRunner = get_runner(settings)
+
+    class CategoryRunner(TestRunner):
+        def get_resultclass(self):
+            return CategoryResult
+
+    test_runner = CategoryRunner(verbosity=1, interactive=False, keepdb=keepdb)
 
     print("Running tests by category...")
     print("=" * 70)
 
-    for category, test_module in categories.items():
-        print(f"\n🧪 Running {category.upper()} tests...")
-        print("-" * 50)
+    total_failures = test_runner.run_tests(list(categories.values()))
 
-        result = run_tests(verbosity=1, pattern=test_module)
-        results[category] = result
-        total_failures += result["failures"]
+    results = {}
+    print()
+    for category in categories:
+        results[category] = {
+            "failures": failures[category],
+            "duration": durations[category],
+            "success": failures[category] == 0,
+        }
 
-        status = "✅ PASSED" if result["success"] else "❌ FAILED"
-        print(f"{status} - {category} tests completed in {result['duration']:.2f}s")
+        status = "✅ PASSED" if results[category]["success"] else "❌ FAILED"
+        print(f"{status} - {category} tests completed in {durations[category]:.2f}s")
 
     return results, total_failures
 
@@ -125,8 +188,8 @@ def check_test_database():
     try:
         from django.db import connection
 
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
+        # Opening the connection is enough to prove it works, and the test runner reuses it
+        connection.ensure_connection()
         print("✅ Test database connection: OK")
         return True
     except Exception as e:
@@ -134,15 +197,29 @@ def check_test_database():
         return False
 
 
+# Shared test client, created lazily and reused by every validation in the process
+_TEST_CLIENT = None
+
+
+def _get_client():
+    """Return the shared test client, creating it on first use."""
+    global _TEST_CLIENT
+    if _TEST_CLIENT is None:
+        from django.test import Client
+
+        _TEST_CLIENT = Client()
+    return _TEST_CLIENT
+
+
 def run_health_check_validation():
     """Run a quick health check validation."""
     try:
-        from django.test import Client
-
-        client = Client()
+        from django.test import RequestFactory
+        from django.urls import resolve
 
-        # Test liveness endpoint
-        response = client.get("/health/liveness/")
+        # Test liveness endpoint, calling the routed view directly; the probe needs no middleware
+        request = RequestFactory().get("/health/liveness/")
+        response = resolve(request.path_info).func(request)
         if response.status_code == 200:
             print("✅ Liveness endpoint: OK")
         else:
@@ -150,7 +227,7 @@ def run_health_check_validation():
             return False
 
         # Test readiness endpoint (may fail in test environment, that's OK)
-        response = client.get("/health/readiness/")
+        response = _get_client().get("/health/readiness/")
         if response.status_code in [200, 503]:
             print("✅ Readiness endpoint: OK")
         else:
@@ -174,12 +251,22 @@ def main():
     parser.add_argument("--failfast", action="store_true", help="Stop on first failure")
     parser.add_argument("--health-check", action="store_true", help="Run health check validation")
     parser.add_argument("--json-output", help="Output results to JSON file")
+    parser.add_argument(
+        "--parallel",
+        type=parallel_type,
+        default="auto",
+        help='Number of test processes, or "auto" for one per CPU core (default); pass 1 to run serially',
+    )
+    parser.add_argument(
+        "--fresh-db", action="store_true", help="Recreate the test database instead of reusing it (use in CI)"
+    )
 
     args = parser.parse_args()
 
     print("🚀 Django Test Runner for Deployment Validation")
     print("=" * 70)
-    print(f"Timestamp: {datetime.now().isoformat()}")
+    session_start = datetime.now()
+    print(f"Timestamp: {session_start.isoformat()}")
     print(f"Python: {sys.version}")
     print(f"Django: {django.get_version()}")
     print()
@@ -200,13 +287,15 @@ def main():
 
     # Run tests based on arguments
     if args.coverage:
-        result = run_coverage_tests()
+        result = run_coverage_tests(keepdb=not args.fresh_db)
         total_failures = result["failures"]
     elif args.categories:
-        results, total_failures = run_specific_test_categories()
+        results, total_failures = run_specific_test_categories(keepdb=not args.fresh_db)
         result = {"failures": total_failures, "success": total_failures == 0}
     else:
-        result = run_tests(verbosity=2, pattern=args.pattern, failfast=args.failfast)
+        result = run_tests(
+            verbosity=2, pattern=args.pattern, failfast=args.failfast, keepdb=not args.fresh_db, parallel=args.parallel
+        )
         total_failures = result["failures"]
 
     # Print summary
@@ -226,6 +315,8 @@ def main():
 
     # Output JSON results if requested
     if args.json_output:
+        # Category runs report no start time of their own; fall back to the header timestamp
+        result.setdefault("start_time", session_start.isoformat())
         with open(args.json_output, "w") as f:
             json.dump(result, f, indent=2)
         print(f"📄 Results saved to: {args.json_output}")
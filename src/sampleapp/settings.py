@@ -3,6 +3,7 @@ Django settings for sampleapp project.
 """
 
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -68,9 +69,18 @@ DATABASES = {
         "PASSWORD": os.environ.get("DB_PASSWORD", "sampleapp_password"),
         "HOST": os.environ.get("DB_HOST", "localhost"),
         "PORT": os.environ.get("DB_PORT", "5432"),
+        # Keep connections open across requests instead of reconnecting per request.
+        # Django pings reused connections before each request, so health checks still see stale ones.
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Test runs use in-memory SQLite for speed; set TEST_DB_ENGINE=postgresql to test against PostgreSQL
+TESTING = sys.argv[1:2] == ["test"] or os.path.basename(sys.argv[0]) == "run_tests.py" or "pytest" in sys.modules
+if TESTING and os.environ.get("TEST_DB_ENGINE", "sqlite") == "sqlite":
+    DATABASES["default"] = {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -117,6 +127,10 @@ CELERY_BEAT_SCHEDULE = {
         "task": "messageapp.tasks.periodic_message_task",
         "schedule": 60.0,  # Run every 60 seconds
     },
+    "refresh-tasklog-stats": {
+        "task": "messageapp.tasks.refresh_tasklog_stats",
+        "schedule": 30.0,  # Keep /api/task-logs/stats/ at most 30 seconds stale
+    },
 }
 
 # Logging
@@ -157,7 +171,7 @@ REST_FRAMEWORK = {
         "rest_framework.authentication.BasicAuthentication",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        "drf_orjson_renderer.renderers.ORJSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",
     ],
 }